@@ -3,15 +3,23 @@
 Content Chunking Script
 
 Splits documents into optimal chunks for embeddings.
-Target: 500-1000 tokens per chunk with overlap for context preservation.
+Target: 500-1000 tokens per chunk, cut at content-defined boundaries so
+chunk boundaries (and downstream caches) survive local edits.
 """
 
+import dataclasses
+import hashlib
 import json
+import numpy as np
+import orjson
+import os
 import tiktoken
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List
 from dataclasses import dataclass
 from colorama import init, Fore, Style
+from tqdm import tqdm
 
 # Initialize colorama
 init()
@@ -29,7 +37,13 @@ PROCESSED_DATA_DIR.mkdir(parents=True, exist_ok=True)
 TARGET_CHUNK_SIZE = 750  # tokens (middle of 500-1000 range)
 MAX_CHUNK_SIZE = 1000    # tokens
 MIN_CHUNK_SIZE = 100     # tokens (minimum viable chunk)
-OVERLAP_SIZE = 50        # tokens (for context preservation)
+
+# Content-defined chunking: rolling-hash window and modulus. A cut is
+# emitted where the hash of the last CDC_WINDOW tokens lands on the
+# boundary condition, so average chunk size tracks TARGET_CHUNK_SIZE.
+CDC_WINDOW = 48
+CDC_HASH_BASE = 1000003
+CDC_HASH_MOD = (1 << 61) - 1
 
 # Initialize tokenizer for OpenAI models
 try:
@@ -38,6 +52,9 @@ except Exception:
     # Fallback to cl100k_base encoding (used by GPT-4 and text-embedding-3)
     ENCODING = tiktoken.get_encoding("cl100k_base")
 
+# Threads for tiktoken's batch encode/decode (Rust releases the GIL)
+NUM_THREADS = os.cpu_count() or 1
+
 
 @dataclass
 class Chunk:
@@ -49,119 +66,49 @@ class Chunk:
     metadata: Dict
 
 
-def count_tokens(text: str) -> int:
-    """
-    Count tokens in text using tiktoken
-    
-    Args:
-        text: Text to count tokens in
-    
-    Returns:
-        int: Number of tokens
+def chunk_by_content(tokens: List[int]) -> List[List[int]]:
     """
-    return len(ENCODING.encode(text))
+    Split a token stream at content-defined boundaries
 
+    A Rabin-style rolling hash over the last CDC_WINDOW token ids picks
+    cut points wherever the hash satisfies the boundary condition, so
+    boundaries depend only on nearby content: editing one paragraph no
+    longer shifts every chunk after it, and the downstream content-hash
+    embedding cache keeps hitting. MIN/MAX bounds keep chunk sizes in
+    the embedding-friendly range; average size tracks TARGET_CHUNK_SIZE.
 
-def split_text_by_tokens(text: str, max_tokens: int, overlap: int = 0) -> List[str]:
-    """
-    Split text into chunks by token count
-    
     Args:
-        text: Text to split
-        max_tokens: Maximum tokens per chunk
-        overlap: Number of tokens to overlap between chunks
-    
+        tokens: Token-id list for the whole document
+
     Returns:
-        List[str]: List of text chunks
+        List[List[int]]: List of token-id lists, one per chunk
     """
-    # Encode the entire text
-    tokens = ENCODING.encode(text)
+    # Factor for removing the outgoing token from the rolling window
+    pow_window = pow(CDC_HASH_BASE, CDC_WINDOW, CDC_HASH_MOD)
+
     chunks = []
-    
     start = 0
-    while start < len(tokens):
-        # Get chunk of tokens
-        end = start + max_tokens
-        chunk_tokens = tokens[start:end]
-        
-        # Decode back to text
-        chunk_text = ENCODING.decode(chunk_tokens)
-        chunks.append(chunk_text)
-        
-        # Move start position (accounting for overlap)
-        start = end - overlap
-        
-        # Break if we've consumed all tokens
-        if end >= len(tokens):
-            break
-    
-    return chunks
+    rolling = 0
 
+    for i, token in enumerate(tokens):
+        # Advance the rolling hash (token + 1 so id 0 contributes)
+        rolling = (rolling * CDC_HASH_BASE + token + 1) % CDC_HASH_MOD
+        if i >= CDC_WINDOW:
+            rolling = (rolling - (tokens[i - CDC_WINDOW] + 1) * pow_window) % CDC_HASH_MOD
 
-def chunk_by_paragraphs(text: str, target_size: int) -> List[str]:
-    """
-    Split text by paragraphs, combining them to reach target size
-    
-    Args:
-        text: Text to split
-        target_size: Target token count per chunk
-    
-    Returns:
-        List[str]: List of text chunks
-    """
-    # Split by double newlines (paragraphs)
-    paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
-    
-    chunks = []
-    current_chunk = []
-    current_tokens = 0
-    
-    for paragraph in paragraphs:
-        para_tokens = count_tokens(paragraph)
-        
-        # If single paragraph is too large, split it
-        if para_tokens > MAX_CHUNK_SIZE:
-            # Save current chunk if it has content
-            if current_chunk:
-                chunks.append('\n\n'.join(current_chunk))
-                current_chunk = []
-                current_tokens = 0
-            
-            # Split the large paragraph by sentences
-            sentences = [s.strip() + '.' for s in paragraph.split('.') if s.strip()]
-            temp_chunk = []
-            temp_tokens = 0
-            
-            for sentence in sentences:
-                sent_tokens = count_tokens(sentence)
-                if temp_tokens + sent_tokens > MAX_CHUNK_SIZE:
-                    if temp_chunk:
-                        chunks.append(' '.join(temp_chunk))
-                    temp_chunk = [sentence]
-                    temp_tokens = sent_tokens
-                else:
-                    temp_chunk.append(sentence)
-                    temp_tokens += sent_tokens
-            
-            if temp_chunk:
-                chunks.append(' '.join(temp_chunk))
-            
+        size = i - start + 1
+        if size < MIN_CHUNK_SIZE:
             continue
-        
-        # Check if adding this paragraph exceeds target
-        if current_tokens + para_tokens > target_size and current_chunk:
-            # Save current chunk and start new one
-            chunks.append('\n\n'.join(current_chunk))
-            current_chunk = [paragraph]
-            current_tokens = para_tokens
-        else:
-            current_chunk.append(paragraph)
-            current_tokens += para_tokens
-    
-    # Add remaining chunk
-    if current_chunk:
-        chunks.append('\n\n'.join(current_chunk))
-    
+
+        # Cut on a hash boundary, or force one at the size ceiling
+        if rolling % TARGET_CHUNK_SIZE == 0 or size >= MAX_CHUNK_SIZE:
+            chunks.append(tokens[start:i + 1])
+            start = i + 1
+
+    # Remaining tail (short documents land here as a single chunk)
+    if start < len(tokens):
+        chunks.append(tokens[start:])
+
     return chunks
 
 
@@ -177,28 +124,25 @@ def chunk_document(doc_data: Dict) -> List[Chunk]:
     """
     content = doc_data["content"]
     doc_id = doc_data["id"]
-    
-    # First try paragraph-based chunking
-    text_chunks = chunk_by_paragraphs(content, TARGET_CHUNK_SIZE)
-    
-    # If chunks are still too large, split by tokens
-    final_chunks = []
-    for chunk_text in text_chunks:
-        token_count = count_tokens(chunk_text)
-        if token_count > MAX_CHUNK_SIZE:
-            # Split further by tokens
-            sub_chunks = split_text_by_tokens(chunk_text, TARGET_CHUNK_SIZE, OVERLAP_SIZE)
-            final_chunks.extend(sub_chunks)
-        else:
-            final_chunks.append(chunk_text)
-    
-    # Create Chunk objects
-    chunks = []
-    for idx, chunk_text in enumerate(final_chunks):
-        chunk = Chunk(
-            chunk_id=f"{doc_id}_chunk_{idx}",
+
+    # Encode the document once and cut at content-defined boundaries
+    doc_tokens = ENCODING.encode(content)
+    final_token_chunks = chunk_by_content(doc_tokens)
+
+    # Decode all final chunks in one parallel Rust call
+    chunk_texts = ENCODING.decode_batch(final_token_chunks, num_threads=NUM_THREADS)
+
+    # Create Chunk objects in one pre-sized pass; token counts come
+    # straight from the token ranges, nothing is re-encoded to measure.
+    # chunk_id is content-addressed: unchanged content keeps its id
+    # across runs, so caches and vector-DB upserts stay stable even
+    # when earlier chunks are added or removed.
+    total_chunks = len(final_token_chunks)
+    return [
+        Chunk(
+            chunk_id=f"{doc_id}_{hashlib.blake2b(chunk_text.encode('utf-8'), digest_size=8).hexdigest()}",
             content=chunk_text,
-            token_count=count_tokens(chunk_text),
+            token_count=len(chunk_tokens),
             chunk_index=idx,
             metadata={
                 "document_id": doc_id,
@@ -209,12 +153,39 @@ def chunk_document(doc_data: Dict) -> List[Chunk]:
                 "tags": doc_data["tags"],
                 "difficulty": doc_data.get("difficulty", ""),
                 "chunk_index": idx,
-                "total_chunks": len(final_chunks)
+                "total_chunks": total_chunks
             }
         )
-        chunks.append(chunk)
-    
-    return chunks
+        for idx, (chunk_text, chunk_tokens) in enumerate(zip(chunk_texts, final_token_chunks))
+    ]
+
+
+def _process_file(filepath: Path) -> tuple[str, List[Dict], int]:
+    """
+    Load one raw document, chunk it, and convert to serializable dicts
+
+    Runs in a worker thread; tiktoken's Rust core releases the GIL
+    during encode/decode, so documents still chunk in parallel without
+    process-pool pickling overhead.
+
+    Args:
+        filepath: Path to the raw JSON document
+
+    Returns:
+        tuple: (filename, chunk dicts, total tokens in this document)
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        doc_data = json.load(f)
+
+    chunks = chunk_document(doc_data)
+
+    # Convert chunks to dictionaries for JSON serialization
+    chunks_dict = [dataclasses.asdict(chunk) for chunk in chunks]
+
+    token_counts = np.fromiter((c.token_count for c in chunks), dtype=np.int32, count=len(chunks))
+    chunk_tokens = int(token_counts.sum())
+
+    return filepath.name, chunks_dict, chunk_tokens
 
 
 def process_all_documents() -> tuple[int, int, int]:
@@ -225,7 +196,7 @@ def process_all_documents() -> tuple[int, int, int]:
         tuple: (total_docs, total_chunks, total_tokens)
     """
     print(f"{Fore.CYAN}🔪 Starting content chunking...{Style.RESET_ALL}\n")
-    
+
     if not RAW_DATA_DIR.exists():
         print(f"{Fore.RED}❌ Error: Raw data directory not found{Style.RESET_ALL}")
         exit(1)
@@ -240,44 +211,37 @@ def process_all_documents() -> tuple[int, int, int]:
     
     total_chunks = 0
     total_tokens = 0
-    all_chunks_data = []
-    
-    for filepath in files:
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                doc_data = json.load(f)
-            
-            # Chunk the document
-            chunks = chunk_document(doc_data)
-            
-            # Convert chunks to dictionaries for JSON serialization
-            chunks_dict = [
-                {
-                    "chunk_id": chunk.chunk_id,
-                    "content": chunk.content,
-                    "token_count": chunk.token_count,
-                    "chunk_index": chunk.chunk_index,
-                    "metadata": chunk.metadata
-                }
-                for chunk in chunks
-            ]
-            
-            all_chunks_data.extend(chunks_dict)
-            
-            chunk_tokens = sum(c.token_count for c in chunks)
-            total_chunks += len(chunks)
-            total_tokens += chunk_tokens
-            
-            print(f"{Fore.GREEN}✅ {filepath.name}{Style.RESET_ALL}")
-            print(f"   Chunks: {len(chunks)}, Tokens: {chunk_tokens:,}")
-            
-        except Exception as e:
-            print(f"{Fore.RED}❌ Error processing {filepath.name}: {e}{Style.RESET_ALL}")
-    
-    # Save all chunks to processed directory
-    output_file = PROCESSED_DATA_DIR / "chunks.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(all_chunks_data, f, indent=2, ensure_ascii=False)
+    per_file_stats = []
+    failures = []
+
+    # Stream chunks to JSON Lines as they are produced so peak memory
+    # stays bounded by one document, not the whole corpus
+    output_file = PROCESSED_DATA_DIR / "chunks.jsonl"
+
+    # Chunk documents in parallel; a single progress bar replaces the
+    # per-file prints, and stats are collected for the final summary
+    with open(output_file, 'wb') as out, ThreadPoolExecutor(max_workers=NUM_THREADS) as executor:
+        futures = [(filepath, executor.submit(_process_file, filepath)) for filepath in files]
+
+        for filepath, future in tqdm(futures, desc="Chunking", unit="doc"):
+            try:
+                filename, chunks_dict, chunk_tokens = future.result()
+
+                for chunk_dict in chunks_dict:
+                    out.write(orjson.dumps(chunk_dict) + b"\n")
+
+                total_chunks += len(chunks_dict)
+                total_tokens += chunk_tokens
+                per_file_stats.append((filename, len(chunks_dict), chunk_tokens))
+
+            except Exception as e:
+                failures.append((filepath.name, e))
+
+    for filename, n_chunks, n_tokens in per_file_stats:
+        print(f"{Fore.GREEN}✅ {filename}{Style.RESET_ALL} — {n_chunks} chunks, {n_tokens:,} tokens")
+
+    for filename, error in failures:
+        print(f"{Fore.RED}❌ Error processing {filename}: {error}{Style.RESET_ALL}")
     
     print(f"\n{Fore.CYAN}📊 Summary:{Style.RESET_ALL}")
     print(f"   {Fore.GREEN}Documents processed: {len(files)}{Style.RESET_ALL}")
@@ -296,8 +260,7 @@ def process_all_documents() -> tuple[int, int, int]:
     }
     
     index_path = PROCESSED_DATA_DIR / "index.json"
-    with open(index_path, 'w', encoding='utf-8') as f:
-        json.dump(index, f, indent=2)
+    index_path.write_bytes(orjson.dumps(index, option=orjson.OPT_INDENT_2))
     
     return len(files), total_chunks, total_tokens
 
@@ -6,12 +6,17 @@ Generates embeddings using OpenAI API for all chunked content.
 Uses text-embedding-3-small model for cost-effectiveness.
 """
 
-import json
+import asyncio
+import base64
+import hashlib
+import numpy as np
+import orjson
 import os
+import random
 import time
 from pathlib import Path
 from typing import List, Dict
-from openai import OpenAI
+from openai import AsyncOpenAI
 from dotenv import load_dotenv
 from colorama import init, Fore, Style
 from tqdm import tqdm
@@ -27,13 +32,16 @@ SCRIPT_DIR = Path(__file__).parent
 DATA_DIR = SCRIPT_DIR.parent / "data"
 PROCESSED_DATA_DIR = DATA_DIR / "processed"
 EMBEDDINGS_DATA_DIR = DATA_DIR / "embeddings"
+EMBEDDING_CACHE_DIR = EMBEDDINGS_DATA_DIR / "cache"
 
-# Ensure embeddings directory exists
+# Ensure embeddings directories exist
 EMBEDDINGS_DATA_DIR.mkdir(parents=True, exist_ok=True)
+EMBEDDING_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 # Configuration
 EMBEDDING_MODEL = "text-embedding-3-small"
 BATCH_SIZE = 100  # Number of texts to embed in one batch
+MAX_CONCURRENT_BATCHES = 8  # In-flight API requests (rate-limit safety)
 MAX_RETRIES = 3
 RETRY_DELAY = 2  # seconds
 
@@ -44,38 +52,130 @@ if not api_key:
     print(f"{Fore.YELLOW}Please set OPENAI_API_KEY in your .env file{Style.RESET_ALL}")
     exit(1)
 
-client = OpenAI(api_key=api_key)
+client = AsyncOpenAI(api_key=api_key)
 
 
-def generate_embeddings_batch(texts: List[str], retry_count: int = 0) -> List[List[float]]:
+def iter_chunk_batches(path: Path, batch_size: int):
+    """
+    Yield batches of chunk dicts from a JSON Lines file
+
+    Parses one line at a time so a large corpus never has to be decoded
+    as a single JSON document.
+
+    Args:
+        path: Path to chunks.jsonl
+        batch_size: Number of chunks per yielded batch
+
+    Yields:
+        List[Dict]: Batches of chunk dictionaries
+    """
+    batch = []
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            batch.append(orjson.loads(line))
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def content_hash(text: str) -> str:
+    """
+    Stable hash of chunk content, used as the embedding cache key
+
+    Args:
+        text: Chunk content
+
+    Returns:
+        str: Hex digest identifying this exact content
+    """
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+async def generate_embeddings_batch(texts: List[str]) -> List[np.ndarray]:
     """
     Generate embeddings for a batch of texts
-    
+
+    Requests base64-encoded float32 vectors, which are ~4x smaller on
+    the wire than JSON float arrays and decode straight into NumPy.
+    Retries with exponential backoff and jitter on API errors.
+
     Args:
         texts: List of text strings to embed
-        retry_count: Current retry attempt
-    
+
     Returns:
-        List[List[float]]: List of embedding vectors
+        List[np.ndarray]: List of float32 embedding vectors
     """
-    try:
-        response = client.embeddings.create(
-            model=EMBEDDING_MODEL,
-            input=texts
-        )
-        
-        # Extract embeddings from response
-        embeddings = [data.embedding for data in response.data]
-        return embeddings
-        
-    except Exception as e:
-        if retry_count < MAX_RETRIES:
-            print(f"\n{Fore.YELLOW}⚠️  API error, retrying in {RETRY_DELAY}s... (attempt {retry_count + 1}/{MAX_RETRIES}){Style.RESET_ALL}")
-            time.sleep(RETRY_DELAY)
-            return generate_embeddings_batch(texts, retry_count + 1)
-        else:
-            print(f"\n{Fore.RED}❌ Failed after {MAX_RETRIES} retries: {e}{Style.RESET_ALL}")
-            raise
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            response = await client.embeddings.create(
+                model=EMBEDDING_MODEL,
+                input=texts,
+                encoding_format="base64"
+            )
+
+            # Decode base64 float32 bytes directly into NumPy arrays
+            embeddings = [
+                np.frombuffer(base64.b64decode(data.embedding), dtype=np.float32)
+                for data in response.data
+            ]
+            return embeddings
+
+        except Exception as e:
+            if attempt == MAX_RETRIES:
+                print(f"\n{Fore.RED}❌ Failed after {MAX_RETRIES} retries: {e}{Style.RESET_ALL}")
+                raise
+
+            # Exponential backoff with jitter (standard for 429s)
+            delay = RETRY_DELAY * (2 ** attempt) + random.random()
+            print(f"\n{Fore.YELLOW}⚠️  API error, retrying in {delay:.1f}s... (attempt {attempt + 1}/{MAX_RETRIES}){Style.RESET_ALL}")
+            await asyncio.sleep(delay)
+
+
+async def _embed_batches(batches: List[List[Dict]], total: int) -> List[List[np.ndarray]]:
+    """
+    Embed all batches concurrently, bounded by a semaphore
+
+    Args:
+        batches: Chunk batches to embed
+        total: Total chunk count (for the progress bar)
+
+    Returns:
+        List[List[np.ndarray]]: Per-batch embeddings, in batch order
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_BATCHES)
+
+    with tqdm(total=total, desc="Generating embeddings", unit="chunk") as pbar:
+        async def embed_one(batch: List[Dict]) -> List[np.ndarray]:
+            # Serve unchanged content from the on-disk cache; only
+            # cache misses go to the API
+            hashes = [content_hash(chunk["content"]) for chunk in batch]
+            embeddings: List = [None] * len(batch)
+            misses = []
+
+            for idx, digest in enumerate(hashes):
+                cache_path = EMBEDDING_CACHE_DIR / f"{digest}.npy"
+                if cache_path.exists():
+                    embeddings[idx] = np.load(cache_path)
+                else:
+                    misses.append(idx)
+
+            if misses:
+                async with semaphore:
+                    fresh = await generate_embeddings_batch([batch[idx]["content"] for idx in misses])
+
+                for idx, vector in zip(misses, fresh):
+                    np.save(EMBEDDING_CACHE_DIR / f"{hashes[idx]}.npy", vector)
+                    embeddings[idx] = vector
+
+            pbar.update(len(batch))
+            return embeddings
+
+        # gather preserves batch order, so matrix rows stay aligned
+        return await asyncio.gather(*(embed_one(batch) for batch in batches))
 
 
 def process_chunks() -> tuple[int, float]:
@@ -86,124 +186,130 @@ def process_chunks() -> tuple[int, float]:
         tuple: (total_chunks_processed, total_cost_estimate)
     """
     print(f"{Fore.CYAN}🤖 Starting embedding generation...{Style.RESET_ALL}\n")
-    
-    # Load chunks
-    chunks_file = PROCESSED_DATA_DIR / "chunks.json"
+
+    # Load chunks from the JSON Lines file, one parse per line
+    chunks_file = PROCESSED_DATA_DIR / "chunks.jsonl"
     if not chunks_file.exists():
-        print(f"{Fore.RED}❌ Error: chunks.json not found{Style.RESET_ALL}")
+        print(f"{Fore.RED}❌ Error: chunks.jsonl not found{Style.RESET_ALL}")
         print(f"{Fore.YELLOW}Please run chunk_content.py first{Style.RESET_ALL}")
         exit(1)
-    
-    with open(chunks_file, 'r', encoding='utf-8') as f:
-        chunks = json.load(f)
-    
-    print(f"{Fore.BLUE}📁 Loaded {len(chunks)} chunks{Style.RESET_ALL}")
+
+    batches = list(iter_chunk_batches(chunks_file, BATCH_SIZE))
+    total_chunks = sum(len(batch) for batch in batches)
+
+    print(f"{Fore.BLUE}📁 Loaded {total_chunks} chunks{Style.RESET_ALL}")
     print(f"{Fore.BLUE}📦 Batch size: {BATCH_SIZE}{Style.RESET_ALL}")
     print(f"{Fore.BLUE}🤖 Model: {EMBEDDING_MODEL}{Style.RESET_ALL}\n")
-    
-    # Process in batches
-    embeddings_data = []
+
+    # Embed batches concurrently; vectors go into a float32 matrix,
+    # metadata (everything except the embedding) into a parallel list
+    batch_results = asyncio.run(_embed_batches(batches, total_chunks))
+
+    metadata_records = []
+    batch_matrices = []
     total_tokens = 0
-    
-    # Create progress bar
-    with tqdm(total=len(chunks), desc="Generating embeddings", unit="chunk") as pbar:
-        for i in range(0, len(chunks), BATCH_SIZE):
-            batch = chunks[i:i + BATCH_SIZE]
-            texts = [chunk["content"] for chunk in batch]
-            
-            try:
-                # Generate embeddings for batch
-                embeddings = generate_embeddings_batch(texts)
-                
-                # Combine chunks with their embeddings
-                for chunk, embedding in zip(batch, embeddings):
-                    embeddings_data.append({
-                        "chunk_id": chunk["chunk_id"],
-                        "embedding": embedding,
-                        "content": chunk["content"],
-                        "token_count": chunk["token_count"],
-                        "metadata": chunk["metadata"]
-                    })
-                    total_tokens += chunk["token_count"]
-                
-                pbar.update(len(batch))
-                
-                # Small delay to respect rate limits
-                time.sleep(0.1)
-                
-            except Exception as e:
-                print(f"\n{Fore.RED}❌ Error processing batch {i // BATCH_SIZE + 1}: {e}{Style.RESET_ALL}")
-                raise
-    
-    # Save embeddings
-    output_file = EMBEDDINGS_DATA_DIR / "embeddings.json"
+
+    for batch, embeddings in zip(batches, batch_results):
+        batch_matrices.append(np.asarray(embeddings, dtype=np.float32))
+
+        # Record metadata in the same order as the matrix rows. The
+        # Pinecone-facing preview fields (truncated content, joined
+        # tags) are computed once here rather than on every upload run.
+        for chunk in batch:
+            metadata_records.append({
+                "chunk_id": chunk["chunk_id"],
+                "content": chunk["content"],
+                "content_preview": chunk["content"][:1000],
+                "tags_joined": ",".join(chunk["metadata"].get("tags", []))[:500],
+                "token_count": chunk["token_count"],
+                "metadata": chunk["metadata"]
+            })
+            total_tokens += chunk["token_count"]
+
+    emb_matrix = np.concatenate(batch_matrices) if batch_matrices else np.empty((0, 0), dtype=np.float32)
+
+    # Save embeddings as binary float16 — half the disk and mmap
+    # footprint of float32, and the precision loss is far below what
+    # cosine-similarity ranking can notice for unit-norm embeddings.
+    # Metadata goes to JSON Lines; matrix row i pairs with line i, and
+    # the upload side can stream line-by-line without loading the lot
+    output_file = EMBEDDINGS_DATA_DIR / "embeddings.npy"
+    meta_file = EMBEDDINGS_DATA_DIR / "embeddings_meta.jsonl"
     print(f"\n{Fore.CYAN}💾 Saving embeddings...{Style.RESET_ALL}")
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(embeddings_data, f, indent=2)
+
+    np.save(output_file, emb_matrix.astype(np.float16))
+    with open(meta_file, 'wb') as f:
+        for record in metadata_records:
+            f.write(orjson.dumps(record) + b"\n")
     
     # Calculate cost estimate
     # text-embedding-3-small: $0.020 per 1M tokens
     cost_estimate = (total_tokens / 1_000_000) * 0.020
     
     print(f"\n{Fore.CYAN}📊 Summary:{Style.RESET_ALL}")
-    print(f"   {Fore.GREEN}Chunks processed: {len(embeddings_data)}{Style.RESET_ALL}")
+    print(f"   {Fore.GREEN}Chunks processed: {len(metadata_records)}{Style.RESET_ALL}")
     print(f"   {Fore.GREEN}Total tokens: {total_tokens:,}{Style.RESET_ALL}")
     print(f"   {Fore.GREEN}Estimated cost: ${cost_estimate:.4f}{Style.RESET_ALL}")
     print(f"   {Fore.BLUE}📁 Output: {output_file}{Style.RESET_ALL}\n")
-    
+
     # Create index file
     index = {
-        "total_embeddings": len(embeddings_data),
+        "total_embeddings": len(metadata_records),
         "total_tokens": total_tokens,
         "model": EMBEDDING_MODEL,
-        "dimensions": len(embeddings_data[0]["embedding"]) if embeddings_data else 0,
+        "dimensions": emb_matrix.shape[1] if metadata_records else 0,
         "estimated_cost_usd": cost_estimate,
         "created_at": time.time()
     }
     
     index_path = EMBEDDINGS_DATA_DIR / "index.json"
-    with open(index_path, 'w', encoding='utf-8') as f:
-        json.dump(index, f, indent=2)
-    
-    return len(embeddings_data), cost_estimate
+    index_path.write_bytes(orjson.dumps(index, option=orjson.OPT_INDENT_2))
+
+    return len(metadata_records), cost_estimate
 
 
 def verify_embeddings():
     """Verify embeddings were generated correctly"""
-    embeddings_file = EMBEDDINGS_DATA_DIR / "embeddings.json"
-    
-    if not embeddings_file.exists():
-        print(f"{Fore.RED}❌ Embeddings file not found{Style.RESET_ALL}")
+    embeddings_file = EMBEDDINGS_DATA_DIR / "embeddings.npy"
+    meta_file = EMBEDDINGS_DATA_DIR / "embeddings_meta.jsonl"
+
+    if not embeddings_file.exists() or not meta_file.exists():
+        print(f"{Fore.RED}❌ Embeddings files not found{Style.RESET_ALL}")
         return False
-    
-    with open(embeddings_file, 'r', encoding='utf-8') as f:
-        embeddings = json.load(f)
-    
-    if not embeddings:
+
+    # mmap keeps the load zero-copy; we only inspect the shape
+    emb_matrix = np.load(embeddings_file, mmap_mode='r')
+    with open(meta_file, 'rb') as f:
+        metadata_records = [orjson.loads(line) for line in f if line.strip()]
+
+    if not len(emb_matrix) or not metadata_records:
         print(f"{Fore.RED}❌ No embeddings found{Style.RESET_ALL}")
         return False
-    
-    # Check first embedding
-    first = embeddings[0]
-    required_fields = ["chunk_id", "embedding", "content", "metadata"]
-    
+
+    if len(emb_matrix) != len(metadata_records):
+        print(f"{Fore.RED}❌ Metadata/vector count mismatch: {len(metadata_records)} vs {len(emb_matrix)}{Style.RESET_ALL}")
+        return False
+
+    # Check first metadata record
+    first = metadata_records[0]
+    required_fields = ["chunk_id", "content", "metadata"]
+
     for field in required_fields:
         if field not in first:
             print(f"{Fore.RED}❌ Missing field: {field}{Style.RESET_ALL}")
             return False
-    
+
     # Check embedding dimensions
-    embedding_dim = len(first["embedding"])
+    embedding_dim = emb_matrix.shape[1]
     expected_dim = 1536  # text-embedding-3-small produces 1536-dimensional vectors
-    
+
     if embedding_dim != expected_dim:
         print(f"{Fore.YELLOW}⚠️  Warning: Unexpected embedding dimension: {embedding_dim} (expected {expected_dim}){Style.RESET_ALL}")
-    
+
     print(f"{Fore.GREEN}✅ Embeddings verification passed{Style.RESET_ALL}")
-    print(f"   Embeddings: {len(embeddings)}")
+    print(f"   Embeddings: {len(emb_matrix)}")
     print(f"   Dimensions: {embedding_dim}")
-    
+
     return True
 
 
@@ -7,15 +7,27 @@ Uploads embeddings to Pinecone vector database.
 Creates index if needed and uploads vectors with metadata.
 """
 
-import json
+import itertools
+import numpy as np
+import orjson
 import os
+import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple
-from pinecone import Pinecone, ServerlessSpec
+from typing import Dict, Iterator, List, Tuple
+from pinecone import ServerlessSpec
+
+# Prefer the gRPC client: HTTP/2 + protobuf cuts per-upsert overhead
+# noticeably at our batch sizes. Falls back to REST when the grpc extra
+# isn't installed; both expose the same Index/upsert API.
+try:
+    from pinecone.grpc import PineconeGRPC as Pinecone
+except ImportError:
+    from pinecone import Pinecone
+
 from dotenv import load_dotenv
 from colorama import init, Fore, Style
-from tqdm import tqdm
 
 # Initialize colorama
 init()
@@ -33,6 +45,9 @@ INDEX_NAME = os.getenv("PINECONE_INDEX_NAME", "system-design-rag")
 DIMENSION = 1536  # text-embedding-3-small dimension
 METRIC = "cosine"  # cosine similarity
 BATCH_SIZE = 100  # Vectors per batch
+MAX_UPLOAD_WORKERS = 8  # Concurrent upsert requests
+MAX_RETRIES = 3
+RETRY_DELAY = 2  # seconds (doubles per attempt)
 
 # Initialize Pinecone
 api_key = os.getenv("PINECONE_API_KEY")
@@ -51,15 +66,18 @@ def create_index_if_needed() -> bool:
     Returns:
         bool: True if index was created, False if it already existed
     """
-    existing_indexes = [index.name for index in pc.list_indexes()]
-    
-    if INDEX_NAME in existing_indexes:
+    # has_index asks the control plane about this one index instead of
+    # listing and describing every index on the project
+    if pc.has_index(INDEX_NAME):
         print(f"{Fore.BLUE}📊 Index '{INDEX_NAME}' already exists{Style.RESET_ALL}")
         return False
-    
+
     print(f"{Fore.CYAN}🔨 Creating index '{INDEX_NAME}'...{Style.RESET_ALL}")
     
-    # Create serverless index (free tier)
+    # Create serverless index (free tier); timeout=None makes the SDK
+    # poll until the index reports ready, replacing the hand-rolled 1s
+    # describe_index busy-wait — upserts against a still-initializing
+    # index would fail with a non-retryable error
     pc.create_index(
         name=INDEX_NAME,
         dimension=DIMENSION,
@@ -67,128 +85,234 @@ def create_index_if_needed() -> bool:
         spec=ServerlessSpec(
             cloud="aws",
             region="us-east-1"
-        )
+        ),
+        timeout=None
     )
-    
-    # Wait for index to be ready
-    print(f"{Fore.YELLOW}⏳ Waiting for index to be ready...{Style.RESET_ALL}")
-    while not pc.describe_index(INDEX_NAME).status['ready']:
-        time.sleep(1)
-    
+
     print(f"{Fore.GREEN}✅ Index created successfully{Style.RESET_ALL}\n")
     return True
 
 
-def prepare_vectors(embeddings_data: List[Dict]) -> List[Tuple]:
+def _build_metadata(item: Dict) -> Dict:
     """
-    Prepare vectors for upload to Pinecone
-    
+    Build the Pinecone metadata payload for one embedding record
+
     Args:
-        embeddings_data: List of embedding dictionaries
-    
+        item: Metadata record from embeddings_meta.jsonl
+
     Returns:
-        List[Tuple]: List of (id, vector, metadata) tuples
+        Dict: Metadata respecting Pinecone's size limits
     """
-    vectors = []
-    
-    for item in embeddings_data:
-        vector_id = item["chunk_id"]
-        vector = item["embedding"]
-        
-        # Prepare metadata (Pinecone has limits on metadata size)
-        metadata = {
-            "content": item["content"][:1000],  # Limit content length
-            "title": item["metadata"]["title"],
-            "category": item["metadata"]["category"],
-            "document_id": item["metadata"]["document_id"],
-            "chunk_index": item["metadata"]["chunk_index"],
-            "total_chunks": item["metadata"]["total_chunks"],
-            "token_count": item["token_count"],
-            "source": item["metadata"].get("source", ""),
-            "difficulty": item["metadata"].get("difficulty", ""),
-            "tags": ",".join(item["metadata"].get("tags", []))[:500]  # Join tags, limit length
-        }
-        
-        vectors.append((vector_id, vector, metadata))
-    
-    return vectors
+    # Preview fields are precomputed by generate_embeddings.py; the
+    # fallbacks keep older metadata files uploadable
+    content = item.get("content_preview")
+    if content is None:
+        content = item["content"][:1000]
+    tags = item.get("tags_joined")
+    if tags is None:
+        tags = ",".join(item["metadata"].get("tags", []))[:500]
+
+    return {
+        "content": content,
+        "title": item["metadata"]["title"],
+        "category": item["metadata"]["category"],
+        "document_id": item["metadata"]["document_id"],
+        "chunk_index": item["metadata"]["chunk_index"],
+        "total_chunks": item["metadata"]["total_chunks"],
+        "token_count": item["token_count"],
+        "source": item["metadata"].get("source", ""),
+        "difficulty": item["metadata"].get("difficulty", ""),
+        "tags": tags
+    }
 
 
-def upload_vectors(vectors: List[Tuple]) -> int:
+def iter_vectors(meta_path: Path, emb_matrix: np.ndarray) -> Iterator[Tuple]:
     """
-    Upload vectors to Pinecone in batches
-    
+    Stream (id, vector, metadata) tuples for upload
+
+    Reads the metadata JSON Lines file one line at a time and pairs
+    line i with matrix row i, so only the current upload batch is ever
+    held in memory. Duplicate chunk_ids (identical content chunked from
+    more than one place) are skipped — upserting them would just
+    overwrite the same vector repeatedly.
+
     Args:
-        vectors: List of (id, vector, metadata) tuples
-    
+        meta_path: Path to embeddings_meta.jsonl
+        emb_matrix: Memory-mapped float16 embedding matrix
+
+    Yields:
+        Tuple: (chunk_id, vector as list, metadata dict)
+    """
+    seen: set = set()
+    skipped = 0
+
+    # Materialize the memmap in BATCH_SIZE row blocks: one sequential
+    # read (and one fp16→fp32 conversion) per block instead of a page
+    # fault and tiny copy per row
+    block = None
+    block_start = 0
+
+    with open(meta_path, 'rb') as f:
+        for i, line in enumerate(f):
+            if not line.strip():
+                continue
+            item = orjson.loads(line)
+            chunk_id = item["chunk_id"]
+            if chunk_id in seen:
+                skipped += 1
+                continue
+            seen.add(chunk_id)
+
+            if block is None or i >= block_start + BATCH_SIZE:
+                block_start = i
+                block = np.asarray(emb_matrix[block_start:block_start + BATCH_SIZE], dtype=np.float32)
+
+            yield (chunk_id, block[i - block_start].tolist(), _build_metadata(item))
+
+    if skipped:
+        print(f"{Fore.YELLOW}⚠️  Skipped {skipped} duplicate chunk ids{Style.RESET_ALL}")
+
+
+def _is_rate_limited(error: Exception) -> bool:
+    """
+    Check whether an upsert failure is the API telling us to slow down
+
+    The REST client raises PineconeApiException with an HTTP status;
+    the gRPC client surfaces an RpcError (directly or as the cause of
+    a PineconeException) whose status code is RESOURCE_EXHAUSTED.
+
+    Args:
+        error: Exception raised by index.upsert
+
+    Returns:
+        bool: True if the error is a rate-limit response
+    """
+    if getattr(error, "status", None) == 429:
+        return True
+
+    for candidate in (error, error.__cause__):
+        code = getattr(candidate, "code", None)
+        if callable(code):
+            try:
+                code = code()
+            except TypeError:
+                continue
+            if getattr(code, "name", None) == "RESOURCE_EXHAUSTED":
+                return True
+
+    return False
+
+
+def _upsert_batch(index, batch: List[Tuple]) -> int:
+    """
+    Upsert one batch, backing off only on rate-limit errors
+
+    Args:
+        index: Pinecone index handle (thread-safe for upserts)
+        batch: List of (id, vector, metadata) tuples
+
+    Returns:
+        int: Number of vectors upserted
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            index.upsert(vectors=batch)
+            return len(batch)
+        except Exception as e:
+            # Retry with exponential backoff on rate limiting; anything
+            # else (or exhausted retries) propagates to the caller
+            if not _is_rate_limited(e) or attempt == MAX_RETRIES:
+                raise
+            time.sleep(RETRY_DELAY * (2 ** attempt))
+
+
+def upload_vectors(vectors: Iterator[Tuple], total: int, index) -> int:
+    """
+    Upload vectors to Pinecone with several batches in flight
+
+    Network round-trips dominate upload time, so batches are pushed
+    through a thread pool; a bounded in-flight window keeps memory at
+    O(workers) batches while still streaming from the metadata file.
+
+    Args:
+        vectors: Iterator of (id, vector, metadata) tuples
+        total: Total number of vectors (for the progress ticker)
+        index: Shared Pinecone index handle
+
     Returns:
         int: Number of vectors uploaded
     """
     print(f"{Fore.CYAN}📤 Uploading vectors to Pinecone...{Style.RESET_ALL}\n")
-    
-    # Get index
-    index = pc.Index(INDEX_NAME)
-    
-    # Upload in batches
+
     total_uploaded = 0
-    
-    with tqdm(total=len(vectors), desc="Uploading vectors", unit="vector") as pbar:
-        for i in range(0, len(vectors), BATCH_SIZE):
-            batch = vectors[i:i + BATCH_SIZE]
-            
-            try:
-                # Upsert batch
-                index.upsert(vectors=batch)
-                total_uploaded += len(batch)
-                pbar.update(len(batch))
-                
-                # Small delay to respect rate limits
-                time.sleep(0.1)
-                
-            except Exception as e:
-                print(f"\n{Fore.RED}❌ Error uploading batch {i // BATCH_SIZE + 1}: {e}{Style.RESET_ALL}")
-                raise
-    
+    batches_done = 0
+    total_batches = -(-total // BATCH_SIZE)  # ceiling division
+    in_flight = []
+
+    # A bare carriage-return ticker on stderr costs one write per
+    # completed batch — cheaper than tqdm's timed redraws, and there's
+    # only one counter to show here anyway
+    with ThreadPoolExecutor(max_workers=MAX_UPLOAD_WORKERS) as executor:
+        while True:
+            batch = list(itertools.islice(vectors, BATCH_SIZE))
+            if batch:
+                in_flight.append(executor.submit(_upsert_batch, index, batch))
+            elif not in_flight:
+                break
+
+            # Drain the oldest future once the window is full, or drain
+            # everything when the stream is exhausted
+            if len(in_flight) >= MAX_UPLOAD_WORKERS * 2 or not batch:
+                total_uploaded += in_flight.pop(0).result()
+                batches_done += 1
+                sys.stderr.write(f"\rUploaded {batches_done}/{total_batches} batches")
+                sys.stderr.flush()
+
+    sys.stderr.write("\n")
     return total_uploaded
 
 
-def verify_upload() -> Dict:
+def verify_upload(index, expected: int) -> Dict:
     """
     Verify vectors were uploaded correctly
-    
+
+    Pinecone stats are eventually consistent, so instead of a fixed
+    sleep this polls describe_index_stats until the vector count
+    catches up with what was uploaded (or the attempts run out).
+
+    Args:
+        index: Shared Pinecone index handle
+        expected: Number of vectors the count should reach
+
     Returns:
         Dict: Index statistics
     """
     print(f"\n{Fore.CYAN}🔍 Verifying upload...{Style.RESET_ALL}\n")
-    
-    index = pc.Index(INDEX_NAME)
-    
-    # Wait for index to update
-    time.sleep(2)
-    
-    # Get index stats
+
     stats = index.describe_index_stats()
-    
+    for _ in range(20):
+        if stats.get('total_vector_count', 0) >= expected:
+            break
+        time.sleep(0.25)
+        stats = index.describe_index_stats()
+
     return stats
 
 
-def test_search():
-    """Test a simple search query"""
+def test_search(index):
+    """Test a simple search query against the shared index handle"""
     print(f"{Fore.CYAN}🧪 Testing search functionality...{Style.RESET_ALL}\n")
-    
-    index = pc.Index(INDEX_NAME)
-    
-    # Load one embedding to use as test query
-    embeddings_file = EMBEDDINGS_DATA_DIR / "embeddings.json"
-    with open(embeddings_file, 'r', encoding='utf-8') as f:
-        embeddings = json.load(f)
-    
-    if not embeddings:
+
+    # Load one embedding to use as test query (mmap avoids a full read)
+    embeddings_file = EMBEDDINGS_DATA_DIR / "embeddings.npy"
+    emb_matrix = np.load(embeddings_file, mmap_mode='r')
+
+    if not len(emb_matrix):
         print(f"{Fore.YELLOW}⚠️  No embeddings to test with{Style.RESET_ALL}")
         return
-    
+
     # Use first embedding as test query
-    test_vector = embeddings[0]["embedding"]
+    test_vector = emb_matrix[0].tolist()
     
     # Query index
     results = index.query(
@@ -211,32 +335,29 @@ def test_search():
 def main():
     """Main execution"""
     try:
-        # Load embeddings
-        embeddings_file = EMBEDDINGS_DATA_DIR / "embeddings.json"
-        if not embeddings_file.exists():
-            print(f"{Fore.RED}❌ Error: embeddings.json not found{Style.RESET_ALL}")
+        # Load embeddings (binary vectors + JSON Lines metadata sidecar)
+        embeddings_file = EMBEDDINGS_DATA_DIR / "embeddings.npy"
+        meta_file = EMBEDDINGS_DATA_DIR / "embeddings_meta.jsonl"
+        if not embeddings_file.exists() or not meta_file.exists():
+            print(f"{Fore.RED}❌ Error: embeddings.npy / embeddings_meta.jsonl not found{Style.RESET_ALL}")
             print(f"{Fore.YELLOW}Please run generate_embeddings.py first{Style.RESET_ALL}")
             return 1
-        
+
         print(f"{Fore.CYAN}📂 Loading embeddings...{Style.RESET_ALL}\n")
-        with open(embeddings_file, 'r', encoding='utf-8') as f:
-            embeddings_data = json.load(f)
-        
-        print(f"{Fore.BLUE}Loaded {len(embeddings_data)} embeddings{Style.RESET_ALL}\n")
-        
-        # Create index if needed
+        emb_matrix = np.load(embeddings_file, mmap_mode='r')
+
+        print(f"{Fore.BLUE}Loaded {len(emb_matrix)} embeddings{Style.RESET_ALL}\n")
+
+        # Create index if needed, then open one handle for the whole
+        # run — each pc.Index() call sets up its own connection pool
         create_index_if_needed()
-        
-        # Prepare vectors
-        print(f"{Fore.CYAN}🔧 Preparing vectors...{Style.RESET_ALL}\n")
-        vectors = prepare_vectors(embeddings_data)
-        print(f"{Fore.GREEN}✅ Prepared {len(vectors)} vectors{Style.RESET_ALL}\n")
-        
-        # Upload vectors
-        uploaded = upload_vectors(vectors)
-        
+        index = pc.Index(INDEX_NAME)
+
+        # Upload vectors, streamed straight from the metadata file
+        uploaded = upload_vectors(iter_vectors(meta_file, emb_matrix), len(emb_matrix), index)
+
         # Verify upload
-        stats = verify_upload()
+        stats = verify_upload(index, uploaded)
         
         print(f"{Fore.CYAN}📊 Index Statistics:{Style.RESET_ALL}")
         print(f"   {Fore.GREEN}Total vectors: {stats.get('total_vector_count', 0)}{Style.RESET_ALL}")
@@ -244,7 +365,7 @@ def main():
         print(f"   {Fore.GREEN}Index fullness: {stats.get('index_fullness', 0):.2%}{Style.RESET_ALL}\n")
         
         # Test search
-        test_search()
+        test_search(index)
         
         print(f"\n{Fore.GREEN}✨ Upload complete!{Style.RESET_ALL}\n")
         print(f"{Fore.BLUE}Index name: {INDEX_NAME}{Style.RESET_ALL}")